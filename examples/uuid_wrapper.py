@@ -13,10 +13,13 @@ import sys
 from uuidcat.category_provider import CategoryProvider
 from uuidcat.uuidcat import UUIDv7Cat
 
-from enum import Enum
+from enum import Enum, IntEnum
 
 
-class ExampleCategory(Enum):
+class ExampleCategory(IntEnum):
+    # Print as "ExampleCategory.TRUCK" rather than IntEnum's bare "2"
+    __str__ = Enum.__str__
+
     CAR = 1
     TRUCK = 2
     BUS = 3
@@ -10,18 +10,24 @@ Description:
 """
 
 import calendar
+import gc
+import os
+import pickle
+import signal
 import time
 import uuid
 import json
-from enum import Enum
+import weakref
+from enum import Enum, IntEnum
 
 import pytest
 
 from uuidcat.category_provider import CategoryProvider
+from uuidcat import uuidcat as uuidcat_module
 from uuidcat.uuidcat import UUIDv7Cat
 
 
-class TestCategory(Enum):
+class TestCategory(IntEnum):
     """Custom categories for testing."""
 
     RED = 10
@@ -51,6 +57,20 @@ def test_new_uuid_creation():
     assert uuid_obj.category == cat
 
 
+@pytest.mark.usefixtures("setup_teardown")
+def test_new_uuid_bit_layout():
+    """Test that the category and timestamp land in the documented bit positions."""
+    start_ms = time.time_ns() // 1_000_000
+    uuid_obj = UUIDv7Cat.new(TestCategory.BLUE)
+    end_ms = time.time_ns() // 1_000_000
+
+    # Category occupies bits 68-75, timestamp the top 48 bits
+    assert (uuid_obj.int >> 68) & 0xFF == TestCategory.BLUE.value
+    assert start_ms <= uuid_obj.int >> 80 <= end_ms
+    assert (uuid_obj.int >> 76) & 0xF == 7
+    assert (uuid_obj.int >> 62) & 0b11 == 0b10
+
+
 @pytest.mark.usefixtures("setup_teardown")
 def test_new_uuid_with_invalid_category_value():
     """Test that creating a UUID with an out-of-range category value fails."""
@@ -66,6 +86,129 @@ def test_new_uuid_with_invalid_category_value():
         UUIDv7Cat.new(BadCategory.TOO_BIG)
 
 
+@pytest.mark.usefixtures("setup_teardown")
+def test_new_non_monotonic():
+    """Test creation without the shared counter."""
+    start_ms = time.time_ns() // 1_000_000
+    uuids = [UUIDv7Cat.new(TestCategory.BLUE, monotonic=False) for _ in range(100)]
+    end_ms = time.time_ns() // 1_000_000
+
+    assert len({u.int for u in uuids}) == 100
+    for uuid_obj in uuids:
+        assert uuid_obj.version == 7
+        assert uuid_obj.variant == uuid.RFC_4122
+        assert uuid_obj.category == TestCategory.BLUE
+        assert start_ms <= uuid_obj.int >> 80 <= end_ms
+
+    fast_obj = UUIDv7Cat.new_fast(TestCategory.BLUE, monotonic=False)
+    assert fast_obj.category == TestCategory.BLUE
+
+    # The counter slot must not repeat the random bits kept after it in byte 9
+    pairs = [_counter_and_rand_b_head(u) for u in uuids]
+    assert any((counter & 0x3F) != tail for counter, tail in pairs)
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_new_fast():
+    """Test creation of UUIDv7Cat instances from the fast PRNG path."""
+    uuids = [UUIDv7Cat.new_fast(TestCategory.GREEN) for _ in range(100)]
+
+    for uuid_obj in uuids:
+        assert uuid_obj.version == 7
+        assert uuid_obj.variant == uuid.RFC_4122
+        assert uuid_obj.category == TestCategory.GREEN
+    ints = [u.int for u in uuids]
+    assert ints == sorted(ints)
+    assert len(set(ints)) == len(ints)
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_new_many():
+    """Test batch creation of UUIDv7Cat instances."""
+    uuids = UUIDv7Cat.new_many(50, TestCategory.RED)
+
+    assert len(uuids) == 50
+    assert len({u.int for u in uuids}) == 50
+    for uuid_obj in uuids:
+        assert isinstance(uuid_obj, UUIDv7Cat)
+        assert uuid_obj.version == 7
+        assert uuid_obj.variant == uuid.RFC_4122
+        assert uuid_obj.category == TestCategory.RED
+
+    assert UUIDv7Cat.new_many(0, TestCategory.RED) == []
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_new_is_monotonic():
+    """Test that UUIDs created back-to-back sort in creation order."""
+    uuids = [UUIDv7Cat.new(TestCategory.GREEN) for _ in range(5000)]
+    ints = [u.int for u in uuids]
+    assert ints == sorted(ints)
+    assert len(set(ints)) == len(ints)
+
+    batch = UUIDv7Cat.new_many_raw(5000, TestCategory.GREEN)
+    assert batch == sorted(batch)
+    assert batch[0] > uuids[-1]._uuid.bytes
+
+
+def _counter_and_rand_b_head(u):
+    """Split out the 12 counter bits and the 6 random bits after them."""
+    b = u.bytes if isinstance(u, uuid.UUID) else u._uuid.bytes
+    counter = ((b[7] & 0x0F) << 8) | ((b[8] & 0x3F) << 2) | (b[9] >> 6)
+    return counter, b[9] & 0x3F
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_counter_seed_does_not_repeat_rand_b():
+    """Test that the counter seed is not copied from the random bits kept in rand_b."""
+    time.sleep(0.002)  # make the next UUID the first of its millisecond
+    pairs = [_counter_and_rand_b_head(UUIDv7Cat.new(TestCategory.RED))]
+    for _ in range(200):
+        time.sleep(0.0011)
+        pairs.append(_counter_and_rand_b_head(UUIDv7Cat.new(TestCategory.RED)))
+    # A seed copied from byte 9 would make these equal in every UUID
+    assert any((counter & 0x3F) != tail for counter, tail in pairs)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+@pytest.mark.usefixtures("setup_teardown")
+def test_new_after_fork_with_clock_lock_held():
+    """Test that a child forked while the clock lock is held can still generate."""
+    lock = uuidcat_module._clock_lock
+    lock.acquire()
+    try:
+        pid = os.fork()
+        if pid == 0:  # child
+            # A child stuck on the inherited lock is killed by SIGALRM
+            signal.alarm(5)
+            code = 1
+            try:
+                UUIDv7Cat.new(TestCategory.RED)
+                UUIDv7Cat.new_many_raw(2, TestCategory.RED)
+                code = 0
+            finally:
+                os._exit(code)
+    finally:
+        lock.release()
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_new_many_raw():
+    """Test batch creation of raw UUIDv7Cat payloads."""
+    raws = UUIDv7Cat.new_many_raw(10, TestCategory.BLUE)
+
+    assert len(raws) == 10
+    for raw in raws:
+        assert isinstance(raw, bytes) and len(raw) == 16
+        assert UUIDv7Cat.get_category(uuid.UUID(bytes=raw)) == TestCategory.BLUE
+
+    with pytest.raises(ValueError):
+        UUIDv7Cat.new_many_raw(-1, TestCategory.BLUE)
+
+
 @pytest.mark.usefixtures("setup_teardown")
 def test_category_property():
     """Test the category property on a UUIDv7Cat instance."""
@@ -95,6 +238,59 @@ def test_str_representation():
     assert uuid.UUID(str(uuid_obj)) == uuid_obj
 
 
+@pytest.mark.usefixtures("setup_teardown")
+def test_equality_and_hash():
+    """Test equality with UUID objects and use as a dict/set key."""
+    uuid_obj = UUIDv7Cat.new(TestCategory.BLUE)
+    same = UUIDv7Cat(str(uuid_obj))
+    other = UUIDv7Cat.new(TestCategory.BLUE)
+
+    assert uuid_obj == same
+    assert uuid_obj == uuid_obj._uuid
+    assert uuid_obj._uuid == uuid_obj
+    assert uuid_obj != other
+    assert uuid_obj != str(uuid_obj)
+
+    assert hash(uuid_obj) == hash(same) == hash(uuid_obj._uuid)
+    assert len({uuid_obj, same, other}) == 2
+    assert {uuid_obj: "a"}[uuid_obj._uuid] == "a"
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_pickle_round_trip():
+    """Test that UUIDv7Cat survives pickling."""
+    uuid_obj = UUIDv7Cat.new(TestCategory.GREEN)
+    data = pickle.dumps(uuid_obj)
+    restored = pickle.loads(data)
+
+    assert isinstance(restored, UUIDv7Cat)
+    assert restored == uuid_obj
+    assert restored.category == TestCategory.GREEN
+    assert str(restored) == str(uuid_obj)
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_unpickle_legacy_format():
+    """Test loading pickles written before UUIDv7Cat defined __reduce__."""
+    expected = uuid.UUID("01a14178-b6ec-7024-b9e7-97e825345aac")
+    # pickle.dumps([UUIDv7Cat(expected)]) from the original release
+    legacy_pickles = [
+        b"(lp0\nccopy_reg\n_reconstructor\np1\n(cuuidcat.uuidcat\nUUIDv7Cat\np2\n"
+        b"c__builtin__\nobject\np3\nNtp4\nRp5\n(dp6\nV_uuid\np7\ng1\n(cuuid\n"
+        b"UUID\np8\ng3\nNtp9\nRp10\n(dp11\nVint\np12\n"
+        b"L2166515710624870054833850452790237868L\nsbsba.",
+        b"\x80\x02]q\x00cuuidcat.uuidcat\nUUIDv7Cat\nq\x01)\x81q\x02}q\x03X\x05"
+        b"\x00\x00\x00_uuidq\x04cuuid\nUUID\nq\x05)\x81q\x06}q\x07X\x03\x00\x00"
+        b"\x00intq\x08\x8a\x10\xacZ4%\xe8\x97\xe7\xb9$p\xec\xb6xA\xa1\x01sbsba.",
+    ]
+    for data in legacy_pickles:
+        [restored] = pickle.loads(data)
+        assert isinstance(restored, UUIDv7Cat)
+        assert restored == expected
+        assert str(restored) == str(expected)
+        assert "cat=INVALID(2)" in repr(restored)
+
+
 @pytest.mark.usefixtures("setup_teardown")
 def test_repr_representation():
     """Test the repr representation of UUIDv7Cat."""
@@ -164,6 +360,19 @@ def test_get_timestamp_sec():
     assert start_time - 2 <= ts_from_uuid <= end_time + 2  # Allow a 2-second window
 
 
+@pytest.mark.usefixtures("setup_teardown")
+def test_get_timestamp_sec_known_values():
+    """Test get_timestamp_sec against fixed timestamps, including repeats."""
+    base_uuid_int = UUIDv7Cat.new(TestCategory.RED).int & ((1 << 80) - 1)
+    first = UUIDv7Cat(uuid.UUID(int=base_uuid_int | (1_700_000_000_999 << 80)))
+    second = UUIDv7Cat(uuid.UUID(int=base_uuid_int | (1_700_000_001_000 << 80)))
+
+    assert UUIDv7Cat.get_timestamp_sec(first) == "2023-11-14T22:13:20Z"
+    assert UUIDv7Cat.get_timestamp_sec(str(first)) == "2023-11-14T22:13:20Z"
+    assert UUIDv7Cat.get_timestamp_sec(second) == "2023-11-14T22:13:21Z"
+    assert UUIDv7Cat.get_timestamp_sec(first) == "2023-11-14T22:13:20Z"
+
+
 @pytest.mark.usefixtures("setup_teardown")
 def test_get_timestamp_sec_invalid_input():
     """Test get_timestamp_sec with an invalid UUID."""
@@ -194,6 +403,35 @@ def test_is_valid_false_cases():
     assert UUIDv7Cat.is_valid(invalid_cat_uuid) is False
 
 
+@pytest.mark.usefixtures("setup_teardown")
+def test_is_valid_rejects_wrong_variant():
+    """Test that a version 7 UUID with a non-RFC 4122 variant is rejected."""
+    base_uuid_int = UUIDv7Cat.new(TestCategory.RED).int
+    # Set the variant bits (62-63) to 0b11 (reserved for future definition)
+    uuid_int = base_uuid_int | (0b11 << 62)
+    bad_variant = uuid.UUID(int=uuid_int)
+
+    assert UUIDv7Cat.is_valid(bad_variant) is False
+    assert UUIDv7Cat.is_valid(str(bad_variant)) is False
+    assert UUIDv7Cat.get_timestamp_sec(bad_variant) is None
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_new_rejects_bare_values():
+    """Test that a plain int/float is rejected whether or not a member was used."""
+    for value in (20, 20.0):
+        with pytest.raises(AttributeError):
+            UUIDv7Cat.new(value)
+
+    UUIDv7Cat.new(TestCategory.GREEN)
+
+    for value in (20, 20.0):
+        with pytest.raises(AttributeError):
+            UUIDv7Cat.new(value)
+        with pytest.raises(AttributeError):
+            UUIDv7Cat.new_fast(value)
+
+
 @pytest.mark.usefixtures("setup_teardown")
 def test_set_categories_from_json():
     """Test loading categories from a JSON string."""
@@ -208,6 +446,7 @@ def test_set_categories_from_json():
     assert getattr(DynamicCategory, "ALPHA").value == 100
     assert getattr(DynamicCategory, "BETA").name == "BETA"
     assert len(DynamicCategory) == 3
+    assert str(DynamicCategory.ALPHA) == "DynamicCategory.ALPHA"
 
     # Verify integration with UUIDv7Cat
     uuid_obj = UUIDv7Cat.new(getattr(DynamicCategory, "GAMMA"))
@@ -215,6 +454,15 @@ def test_set_categories_from_json():
     assert UUIDv7Cat.is_valid(uuid_obj)
 
 
+def test_default_category_str():
+    """Test that the default IntEnum categories keep Enum-style str() output."""
+    from uuidcat.category import Category
+
+    assert str(Category.TYPE_A) == "Category.TYPE_A"
+    assert f"{Category.TYPE_B}" == "Category.TYPE_B"
+    assert Category.TYPE_A == 1
+
+
 @pytest.mark.usefixtures("setup_teardown")
 def test_set_categories_from_invalid_json():
     """Test that loading from a malformed JSON string raises an error."""
@@ -259,3 +507,175 @@ def test_is_valid_after_category_change():
 
     # 3. The original UUID should now be considered invalid
     assert UUIDv7Cat.is_valid(uuid_with_test_category) is False
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_get_value_map():
+    """Test that the value map tracks the configured categories."""
+    assert CategoryProvider.get_value_map()[20] is TestCategory.GREEN
+
+    CategoryProvider.reset()
+    from uuidcat.category import Category as DefaultCategory
+
+    assert CategoryProvider.get_value_map()[1] is DefaultCategory.TYPE_A
+    assert CategoryProvider.get_value_map().get(20) is None
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_maps_follow_set_categories_during_lookup(monkeypatch):
+    """Test that a lookup racing set_categories() cannot keep the old enum's maps."""
+    CategoryProvider.reset()
+    get_categories = CategoryProvider.get_categories
+
+    def get_then_switch():
+        # Another thread switches the categories right after the first read.
+        current = get_categories()
+        if current is not TestCategory:
+            CategoryProvider.set_categories(TestCategory)
+        return current
+
+    monkeypatch.setattr(CategoryProvider, "get_categories", get_then_switch)
+    CategoryProvider.get_value_map()
+    monkeypatch.undo()
+
+    current = CategoryProvider.get_categories()
+    assert CategoryProvider.get_value_map() is current._value2member_map_
+    assert set(CategoryProvider.get_repr_map()) == {m.value for m in current}
+
+    CategoryProvider.reset()
+    monkeypatch.setattr(CategoryProvider, "get_categories", get_then_switch)
+    CategoryProvider.get_repr_map()
+    monkeypatch.undo()
+
+    current = CategoryProvider.get_categories()
+    assert set(CategoryProvider.get_repr_map()) == {m.value for m in current}
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_get_category_string_formats():
+    """Test get_category with the various string spellings of a UUID."""
+    uuid_obj = UUIDv7Cat.new(TestCategory.GREEN)
+    canonical = str(uuid_obj)
+
+    assert UUIDv7Cat.get_category(canonical.upper()) == TestCategory.GREEN
+    assert UUIDv7Cat.get_category(canonical.replace("-", "")) == TestCategory.GREEN
+    assert UUIDv7Cat.get_category("{" + canonical + "}") == TestCategory.GREEN
+    assert UUIDv7Cat.get_category("urn:uuid:" + canonical) == TestCategory.GREEN
+
+    # Malformed strings of the fast-path lengths
+    assert UUIDv7Cat.get_category(canonical[:-1] + "g") is None
+    assert UUIDv7Cat.get_category(canonical.replace("-", " ")) is None
+    assert UUIDv7Cat.get_category("-" + canonical[:8] + canonical[9:]) is None
+    assert UUIDv7Cat.get_category(str(uuid.uuid4())) is None
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_repr_after_category_change():
+    """Test that repr follows the currently configured categories."""
+    uuid_obj = UUIDv7Cat.new(TestCategory.RED)
+    assert "cat=RED(10)" in repr(uuid_obj)
+
+    class OtherCategory(Enum):
+        CRIMSON = 10
+
+    CategoryProvider.set_categories(OtherCategory)
+    assert "cat=CRIMSON(10)" in repr(uuid_obj)
+
+    CategoryProvider.reset()
+    assert "cat=INVALID(10)" in repr(uuid_obj)
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_get_category_str_after_category_change():
+    """Test that repeated string lookups follow category changes."""
+    uuid_str = str(UUIDv7Cat.new(TestCategory.RED))
+    assert UUIDv7Cat.get_category(uuid_str) == TestCategory.RED
+    assert UUIDv7Cat.get_category(uuid_str) == TestCategory.RED
+
+    from uuidcat.category import Category as DefaultCategory
+
+    CategoryProvider.set_categories(DefaultCategory)
+    assert UUIDv7Cat.get_category(uuid_str) is None
+    assert UUIDv7Cat.is_valid(uuid_str) is False
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_set_categories_from_json_non_integer_value():
+    """Test that JSON categories with non-integer values are rejected."""
+    with pytest.raises(ValueError):
+        CategoryProvider.set_categories_from_json('{"A": "not-a-number"}')
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_set_categories_from_json_reuses_enum():
+    """Test that reloading the same JSON payload reuses the generated enum."""
+    json_payload = json.dumps({"ALPHA": 100, "BETA": 101})
+
+    CategoryProvider.set_categories_from_json(json_payload)
+    first = CategoryProvider.get_categories()
+    CategoryProvider.set_categories(TestCategory)
+    CategoryProvider.set_categories_from_json(json_payload)
+    assert CategoryProvider.get_categories() is first
+
+    # A different enum name, or a reset, builds a fresh class
+    CategoryProvider.set_categories_from_json(json_payload, enum_name="Other")
+    assert CategoryProvider.get_categories() is not first
+    CategoryProvider.reset()
+    CategoryProvider.set_categories_from_json(json_payload)
+    assert CategoryProvider.get_categories() is not first
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_set_categories_from_json_keeps_one_enum():
+    """Test that reloading changing JSON does not keep every generated enum alive."""
+    refs = []
+    for i in range(50):
+        CategoryProvider.set_categories_from_json(json.dumps({"ALPHA": i}))
+        refs.append(weakref.ref(CategoryProvider.get_categories()))
+    CategoryProvider.set_categories(TestCategory)
+    gc.collect()
+
+    assert sum(ref() is not None for ref in refs) <= 1
+
+    # The most recent payload is still reused
+    CategoryProvider.set_categories_from_json(json.dumps({"ALPHA": 49}))
+    assert CategoryProvider.get_categories() is refs[-1]()
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_static_methods_accept_subclass():
+    """Test that the static helpers accept subclasses of UUIDv7Cat."""
+
+    class MyUUID(UUIDv7Cat):
+        pass
+
+    uuid_obj = MyUUID(UUIDv7Cat.new(TestCategory.BLUE)._uuid)
+    assert UUIDv7Cat.get_category(uuid_obj) == TestCategory.BLUE
+    assert UUIDv7Cat.is_valid(uuid_obj) is True
+    assert UUIDv7Cat.get_timestamp_sec(uuid_obj) is not None
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_instances_have_no_dict():
+    """Test that UUIDv7Cat instances use slots but still support weak references."""
+    uuid_obj = UUIDv7Cat.new(TestCategory.RED)
+    assert not hasattr(uuid_obj, "__dict__")
+    with pytest.raises(AttributeError):
+        uuid_obj.extra = 1
+
+    ref = weakref.ref(uuid_obj)
+    assert ref() is uuid_obj
+
+
+@pytest.mark.usefixtures("setup_teardown")
+def test_is_valid_many():
+    """Test batch validation against the single-item is_valid."""
+    valid = UUIDv7Cat.new(TestCategory.BLUE)
+    base_uuid_int = valid.int
+    unknown_cat = UUIDv7Cat(uuid.UUID(int=(base_uuid_int & ~(0xFF << 68)) | (99 << 68)))
+    inputs = [valid, str(valid), valid._uuid, uuid.uuid4(), "not-a-uuid", unknown_cat]
+
+    results = UUIDv7Cat.is_valid_many(inputs)
+    assert results == [True, True, True, False, False, False]
+    assert results == [UUIDv7Cat.is_valid(u) for u in inputs]
+    assert UUIDv7Cat.is_valid_many(iter([])) == []
@@ -17,12 +17,15 @@ Description:
     3. Testing - Allows the submodule to have its own tests without external dependencies
 """
 
-from enum import Enum
+from enum import Enum, IntEnum
 
 
-class Category(Enum):
+class Category(IntEnum):
     """Default categories for UUIDv7Cat"""
 
+    # Keep "Category.TYPE_A" as the str()/format() text (IntEnum gives "1" on 3.11+)
+    __str__ = Enum.__str__
+
     UNKNOWN = 0
     TYPE_A = 1
     TYPE_B = 2
@@ -10,14 +10,20 @@ Description:
 """
 
 import json
-from enum import Enum
-from typing import Optional, Type, cast, Dict, Any
+from enum import Enum, IntEnum
+from typing import Optional, Type, cast, Dict, Any, Tuple
 
 
 class CategoryProvider:
     """Singleton provider for category configuration"""
 
     _category_enum: Optional[Type[Enum]] = None
+    # Lookup maps of the current enum; only replaced whole, together with the enum
+    _value_map: Dict[Any, Enum] = {}
+    _repr_map: Dict[Any, str] = {}
+    # Last enum built by set_categories_from_json, with its (enum_name, json_payload).
+    # Only one is kept, so reloading changing config does not accumulate classes.
+    _json_enum: Optional[Tuple[Tuple[str, str], Type[Enum]]] = None
 
     @classmethod
     def set_categories(cls, category_enum: Type[Enum]):
@@ -25,6 +31,7 @@ class CategoryProvider:
         if not issubclass(category_enum, Enum):
             raise TypeError("category_enum must be an Enum class")
         cls._category_enum = category_enum
+        cls._build_maps(category_enum)
 
     @classmethod
     def set_categories_from_json(
@@ -35,13 +42,24 @@ class CategoryProvider:
         The JSON string should contain a dictionary of category names to integer values.
         e.g., '{"CAR": 1, "TRUCK": 2}'
         """
+        key = (enum_name, json_payload)
+        cached = cls._json_enum
+        if cached is not None and cached[0] == key:
+            # Same payload as before (e.g. a config re-read): reuse the class
+            cls.set_categories(cached[1])
+            return
+
         try:
             categories = json.loads(json_payload)
-            # Create an Enum class dynamically from the JSON data
-            dynamic_enum_class = Enum(enum_name, categories)
+            # Create an IntEnum class dynamically from the JSON data
+            dynamic_enum_class = IntEnum(enum_name, categories)
+            # Keep "Name.MEMBER" as the str() text, as with the plain Enum before
+            dynamic_enum_class.__str__ = Enum.__str__
             cls.set_categories(cast(Type[Enum], dynamic_enum_class))
-        except (json.JSONDecodeError, TypeError) as e:
-            # Catches both bad JSON and invalid dictionary values for an Enum
+            cls._json_enum = (key, dynamic_enum_class)
+        except (ValueError, TypeError) as e:
+            # Catches both bad JSON (JSONDecodeError is a ValueError) and
+            # dictionary values that are not valid integers for an IntEnum
             raise ValueError(f"Failed to load categories from JSON payload: {e}") from e
 
     @classmethod
@@ -54,7 +72,34 @@ class CategoryProvider:
             return Category
         return cls._category_enum
 
+    @classmethod
+    def get_value_map(cls) -> Dict[Any, Enum]:
+        """Get the value -> member map of the current category enum"""
+        return cls._value_map
+
+    @classmethod
+    def get_repr_map(cls) -> Dict[Any, str]:
+        """Get a value -> "NAME(value)" map of the current category enum"""
+        return cls._repr_map
+
     @classmethod
     def reset(cls):
         """Reset to default categories (useful for testing)"""
         cls._category_enum = None
+        cls.invalidate_cache()
+        cls._json_enum = None
+
+    @classmethod
+    def invalidate_cache(cls):
+        """Rebuild the lookup maps derived from the current enum"""
+        cls._build_maps(cls.get_categories())
+
+    @classmethod
+    def _build_maps(cls, category_enum: Type[Enum]):
+        # Built here, where the enum is set, and never filled in by readers: a
+        # lookup racing set_categories() could otherwise store the old enum's maps.
+        cls._value_map = category_enum._value2member_map_
+        cls._repr_map = {m.value: f"{m.name}({m.value})" for m in category_enum}
+
+
+CategoryProvider.reset()
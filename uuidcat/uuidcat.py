@@ -8,25 +8,222 @@ License: Unlicense
 Description:
     Custom UUIDv7 variant with an 8-bit category field.
     - Preserves RFC 4122 version/variant compliance
-    - First byte encodes "category"
+    - Bits 68-75 (top of rand_a) encode "category"
+    - A 12-bit counter after the category keeps IDs from the same millisecond
+      ordered (RFC 9562 section 6.2, method 1)
     - Remaining layout matches UUIDv7 as closely as possible
 """
 
 # fixes forward references (quoted class names) that can cause issues with "|".
 from __future__ import annotations
 
+import functools
 import os
+import random
+import struct
+import threading
 import time
 import uuid
+from collections.abc import Iterable
 from uuidcat.category_provider import CategoryProvider
 
 _UUID_VERSION = 7
 _UUID_VARIANT_RFC4122_BITS = 0b10
+_COUNTER_MAX = (1 << 12) - 1
+_VERSION_VARIANT_MASK = (0xF << 76) | (0b11 << 62)
+_VERSION_VARIANT_BITS = (_UUID_VERSION << 76) | (_UUID_VARIANT_RFC4122_BITS << 62)
+
+# Bound once; used on the generation hot path.
+_HEAD = struct.Struct(">QH")
+_object_new = object.__new__
+_object_setattr = object.__setattr__
+_int_from_bytes = int.from_bytes
+_SAFE_UNKNOWN = uuid.SafeUUID.unknown
+
+# Monotonic state shared by all generators in the process.
+_clock_lock = threading.Lock()
+_last_ms = -1
+_counter = 0
+
+# Per-thread random sources: `pool`/`pos` buffer os.urandom output for new(),
+# `rng` is the PRNG behind new_fast(). Both are created on first use.
+_URANDOM_POOL_SIZE = 4096
+_thread_state = threading.local()
+
+
+def _reset_after_fork() -> None:
+    # A forked child must not reuse its parent's buffered bytes or PRNG stream,
+    # and must not inherit _clock_lock held by a thread that no longer exists.
+    global _thread_state, _clock_lock
+    _thread_state = threading.local()
+    _clock_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _category_field(cat) -> int:
+    """Return the 8-bit category field for an enum member, range-checked."""
+    # _value_ is the member's stored value: a plain attribute read, unlike the
+    # Enum.value descriptor. Non-members (e.g. a bare int) have no _value_.
+    value = cat._value_
+    if not (0 <= value <= 255):
+        raise ValueError("Category value must be in range 0..255")
+    return value & 0xFF
+
+
+def _urandom16() -> bytearray:
+    """Return 16 bytes of os.urandom output, refilled in 4 KiB blocks per thread."""
+    state = _thread_state
+    pos = getattr(state, "pos", _URANDOM_POOL_SIZE)
+    if pos >= _URANDOM_POOL_SIZE:
+        state.pool = os.urandom(_URANDOM_POOL_SIZE)
+        pos = 0
+    state.pos = pos + 16
+    return bytearray(state.pool[pos : pos + 16])
+
+
+def _fast_random16() -> bytearray:
+    """Return 16 bytes from this thread's PRNG (not cryptographically secure)."""
+    rng = getattr(_thread_state, "rng", None)
+    if rng is None:
+        rng = _thread_state.rng = random.Random(os.urandom(32))
+    return bytearray(rng.randbytes(16))
+
+
+def _now_ms() -> int:
+    """
+    Return the current Unix time in whole milliseconds.
+
+    Exact integer division is used deliberately: RFC 9562's divide-by-1024
+    shortcut is only for sub-millisecond fractions, and shifting nanoseconds
+    right by 20 would put the timestamp field about 4.6% behind real time.
+    """
+    return time.time_ns() // 1_000_000
+
+
+def _random_counter(buf: bytearray, off: int) -> int:
+    """
+    Return 12 random bits to seed a new counter.
+
+    Taken from bits that _fill_fields overwrites completely (byte 7's low nibble
+    and byte 8), so no random bit kept in rand_b is repeated in the counter.
+    """
+    return ((buf[off + 7] & 0x0F) << 8) | buf[off + 8]
+
+
+def _advance_clock(now_ms: int, seed: int) -> tuple[int, int]:
+    """
+    Return the (timestamp, counter) pair for the next UUID.
+
+    Must be called with `_clock_lock` held. The counter is reseeded with its top
+    bit clear on each new millisecond, leaving room for at least 2048 increments;
+    on overflow, or if the clock steps backwards, the timestamp is advanced.
+    """
+    global _last_ms, _counter
+    if now_ms > _last_ms:
+        _last_ms = now_ms
+        _counter = seed & (_COUNTER_MAX >> 1)
+    elif _counter < _COUNTER_MAX:
+        _counter += 1
+    else:
+        _last_ms += 1
+        _counter = seed & (_COUNTER_MAX >> 1)
+    return _last_ms, _counter
+
+
+def _fill_fields(
+    buf: bytearray, off: int, ts_ms: int, cat_field: int, counter: int
+) -> None:
+    """Overwrite the fixed fields of the 16-byte UUID at buf[off:off + 16]."""
+    _HEAD.pack_into(
+        buf,
+        off,
+        # Bytes 0-7: 48-bit timestamp | version (bits 76-79) | category (bits 68-75)
+        # | counter bits 11-8
+        ((ts_ms & ((1 << 48) - 1)) << 16)
+        | (_UUID_VERSION << 12)
+        | (cat_field << 4)
+        | (counter >> 8),
+        # Bytes 8-9: RFC 4122 variant bits (bits 62-63) | counter bits 7-0
+        # | 6 random bits of rand_b
+        (_UUID_VARIANT_RFC4122_BITS << 14)
+        | ((counter & 0xFF) << 6)
+        | (buf[off + 9] & 0x3F),
+    )
+
+
+def _trusted_uuid(raw: bytes | bytearray) -> uuid.UUID:
+    """
+    Build a uuid.UUID from 16 bytes already known to be a valid UUIDv7Cat.
+
+    Skips uuid.UUID.__init__, which re-parses and re-validates its argument;
+    the generators always produce well-formed payloads.
+    """
+    u = _object_new(uuid.UUID)
+    _object_setattr(u, "int", _int_from_bytes(raw, "big"))
+    _object_setattr(u, "is_safe", _SAFE_UNKNOWN)
+    return u
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_sec(sec: int) -> str:
+    """Format epoch seconds as ISO 8601 UTC; memoized for recurring seconds."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec))
+
+
+def _fast_parse(u: str) -> int | None:
+    """
+    Parse a UUID string into its 128-bit value.
+
+    Canonical (36-char) and dashless (32-char) strings are decoded directly with
+    bytes.fromhex; other spellings (braces, "urn:uuid:") fall back to uuid.UUID.
+
+    Returns:
+        int: the value, if it is a well-formed v7 UUID with the RFC 4122 variant.
+        None: otherwise.
+    """
+    n = len(u)
+    try:
+        # Cheap shape and version-digit checks reject most bad input unparsed
+        if n == 36:
+            if u[8] != "-" or u[13] != "-" or u[18] != "-" or u[23] != "-":
+                return None
+            if u[14] != "7":
+                return None
+            b = bytes.fromhex(u.replace("-", ""))
+        elif n == 32:
+            if u[12] != "7":
+                return None
+            b = bytes.fromhex(u)
+        else:
+            b = uuid.UUID(u).bytes
+    except ValueError:
+        return None
+
+    if len(b) != 16:
+        return None
+    u_int = _int_from_bytes(b, "big")
+    if u_int & _VERSION_VARIANT_MASK == _VERSION_VARIANT_BITS:
+        return u_int
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _category_id_from_str(u: str) -> int | None:
+    """Return the raw category id of a UUID string, or None; memoized per string."""
+    u_int = _fast_parse(u)
+    if u_int is None:
+        return None
+    return (u_int >> 68) & 0xFF
 
 
 class UUIDv7Cat:
     """UUIDv7 with an embedded category field."""
 
+    __slots__ = ("_uuid", "_str", "__weakref__")
+
     def __init__(self, u: str | uuid.UUID):
         if isinstance(u, str):
             self._uuid = uuid.UUID(u)
@@ -39,6 +236,16 @@ class UUIDv7Cat:
 
         if self._uuid.version != _UUID_VERSION:
             raise ValueError("Not a v7 UUID")
+        # Canonical string form, filled in on first use by __str__
+        self._str: str | None = None
+
+    @classmethod
+    def _from_trusted(cls, u: uuid.UUID) -> "UUIDv7Cat":
+        """Wrap a UUID already known to be v7, skipping the checks in __init__."""
+        obj = _object_new(cls)
+        obj._uuid = u
+        obj._str = None
+        return obj
 
     @property
     def int(self):
@@ -47,14 +254,10 @@ class UUIDv7Cat:
     @property
     def category(self):
         """Return the embedded type field (0–255)."""
-        Category = CategoryProvider.get_categories()
         # The category is stored in the 8 most significant bits of the `rand_a` field.
         # These are bits 68-75 of the UUID.
-        type_id = (self.int >> 68) & 0xFF
-        if type_id in Category._value2member_map_:
-            return Category(type_id)
-        else:
-            return None
+        type_id = (self._uuid.int >> 68) & 0xFF
+        return CategoryProvider.get_value_map().get(type_id)
 
     @property
     def version(self):
@@ -65,81 +268,166 @@ class UUIDv7Cat:
         return self._uuid.variant
 
     def __repr__(self):
-        cat = self.category
-        cat_id = (self.int >> 68) & 0xFF
-        cat_str = (
-            f"cat={cat.name}({cat.value})"
-            if cat is not None
-            else f"cat=INVALID({cat_id})"
-        )
-        timestamp_part = (self.int >> 80) & ((1 << 48) - 1)
+        uuid_int = self._uuid.int
+        cat_id = (uuid_int >> 68) & 0xFF
+        cat_str = CategoryProvider.get_repr_map().get(cat_id) or f"INVALID({cat_id})"
+        timestamp_part = uuid_int >> 80
         return (
-            f"UUIDv7Cat('{self._uuid}', ver={self.version}, variant={self.variant}, "
-            f"timestamp_part={timestamp_part}, {cat_str})"
+            f"UUIDv7Cat('{self}', ver={self.version}, variant={self.variant}, "
+            f"timestamp_part={timestamp_part}, cat={cat_str})"
         )
 
     def __str__(self):
-        return str(self._uuid)
+        s = self._str
+        if s is None:
+            s = self._str = str(self._uuid)
+        return s
+
+    def __reduce__(self):
+        # Pickle as the raw 16 bytes rather than the wrapped UUID's int state
+        return (_unpickle, (type(self), self._uuid.bytes))
+
+    def __setstate__(self, state):
+        # Pickles written before __reduce__ existed carry the old instance dict
+        # ({"_uuid": UUID}); a (dict, slots) pair is accepted for completeness.
+        if isinstance(state, tuple):
+            dict_state, slot_state = state
+            state = {**(dict_state or {}), **(slot_state or {})}
+        self._uuid = state["_uuid"]
+        self._str = None
 
     def __eq__(self, other):
-        return isinstance(other, (UUIDv7Cat, uuid.UUID)) and self.int == other.int
+        if isinstance(other, (UUIDv7Cat, uuid.UUID)):
+            return self._uuid.int == other.int
+        return NotImplemented
+
+    def __hash__(self):
+        # Must match uuid.UUID's hash, since the two compare equal
+        return hash(self._uuid.int)
 
     @classmethod
-    def new(cls, cat) -> "UUIDv7Cat":
+    def new(cls, cat, monotonic: bool = True) -> "UUIDv7Cat":
         """
         Create a new UUIDv7Cat instance with a given category.
 
         Args:
             cat: category/type identifier (enum member).
+            monotonic: if True (default), a shared counter orders UUIDs created
+                within the same millisecond. If False, those bits stay random,
+                which skips the process-wide lock but gives no ordering (or
+                collision protection from the counter) within a millisecond.
+
+        Returns:
+            UUIDv7Cat: UUID object with type embedded.
+        """
+        return cls._from_random(cat, _urandom16(), monotonic)
+
+    @classmethod
+    def new_fast(cls, cat, monotonic: bool = True) -> "UUIDv7Cat":
+        """
+        Create a new UUIDv7Cat instance with a given category, using a fast PRNG.
+
+        Same layout and ordering as `new`, but the random bits come from a
+        per-thread `random.Random` (seeded once from os.urandom) instead of a
+        system call per UUID.
+
+        Warning: the random bits are NOT cryptographically secure and future
+        values may be predictable. Do not use these UUIDs where guessing an ID
+        would be a security problem (tokens, unlisted resources).
+
+        Args:
+            cat: category/type identifier (enum member).
+            monotonic: as for `new`.
 
         Returns:
             UUIDv7Cat: UUID object with type embedded.
         """
-        if not (0 <= cat.value <= 255):
-            raise ValueError("Category value must be in range 0..255")
+        return cls._from_random(cat, _fast_random16(), monotonic)
+
+    @classmethod
+    def _from_random(cls, cat, buf: bytearray, monotonic: bool) -> "UUIDv7Cat":
+        """Build a UUIDv7Cat over 16 random bytes, overwriting the fixed fields."""
+        cat_field = _category_field(cat)
 
         # Manually construct the UUIDv7 to ensure Python version compatibility.
-        unix_ts_ms = int(time.time() * 1000)
-        ts_field = unix_ts_ms & ((1 << 48) - 1)
-
-        # Generate 74 random bits for rand_a and rand_b
-        rand_bytes = os.urandom(10)  # 80 bits is more than enough
-        rand_int = int.from_bytes(rand_bytes, "big")
-        rand_a = rand_int >> 62 & ((1 << 12) - 1)  # 12 bits for rand_a
-        rand_b = rand_int & ((1 << 62) - 1)  # 62 bits for rand_b
-
-        cat_field = cat.value & 0xFF
-
-        # Construct the 128-bit integer
-        uuid_int = (
-            (ts_field << 80)  # 48-bit timestamp
-            | (_UUID_VERSION << 76)
-            | (rand_a << 64)
-            | (_UUID_VARIANT_RFC4122_BITS << 62)
-            | rand_b
-        )
-        # Clear the 8 bits in rand_a where the category will be stored (bits 68-75)
-        cleared_int = uuid_int & ~((0xFF) << 68)
+        unix_ts_ms = _now_ms()
+
+        if monotonic:
+            with _clock_lock:
+                ts_ms, counter = _advance_clock(unix_ts_ms, _random_counter(buf, 0))
+        else:
+            # Fill the counter slot with fresh random bits taken from bytes
+            # that _fill_fields overwrites, so the slot stays fully random
+            ts_ms, counter = unix_ts_ms, _random_counter(buf, 0)
+        _fill_fields(buf, 0, ts_ms, cat_field, counter)
+
+        return cls._from_trusted(_trusted_uuid(buf))
+
+    @classmethod
+    def new_many(cls, n: int, cat) -> list["UUIDv7Cat"]:
+        """
+        Create `n` new UUIDv7Cat instances sharing a category.
 
-        # Inject the category into the cleared bits
-        uuid_int = cleared_int | (cat_field << 68)
-        return cls(uuid.UUID(int=uuid_int))
+        Randomness is drawn with a single os.urandom call and the clock is read
+        once; the batch is ordered by the same counter as `new`.
+
+        Args:
+            n: number of UUIDs to create.
+            cat: category/type identifier (enum member).
+
+        Returns:
+            list[UUIDv7Cat]: the new UUID objects.
+        """
+        from_trusted = cls._from_trusted
+        return [from_trusted(_trusted_uuid(raw)) for raw in cls.new_many_raw(n, cat)]
+
+    @staticmethod
+    def new_many_raw(n: int, cat) -> list[bytes]:
+        """
+        Create `n` new UUIDv7Cat values as raw 16-byte strings.
+
+        Same as `new_many`, but skips building UUID objects; useful when the
+        values go straight to a database or wire format.
+
+        Args:
+            n: number of UUIDs to create.
+            cat: category/type identifier (enum member).
+
+        Returns:
+            list[bytes]: 16-byte big-endian UUID payloads.
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        cat_field = _category_field(cat)
+
+        unix_ts_ms = _now_ms()
+
+        pool = bytearray(os.urandom(16 * n))
+        out = []
+        with _clock_lock:
+            for off in range(0, 16 * n, 16):
+                ts_ms, counter = _advance_clock(unix_ts_ms, _random_counter(pool, off))
+                _fill_fields(pool, off, ts_ms, cat_field, counter)
+                out.append(bytes(pool[off : off + 16]))
+        return out
 
     @staticmethod
     def _basic_validity_check(
         u: str | uuid.UUID | "UUIDv7Cat",
-    ) -> uuid.UUID | None:
+    ) -> int | None:
+        """Return the 128-bit value of a valid v7 UUID, or None."""
         if isinstance(u, str):
-            try:
-                u = uuid.UUID(u)
-            except (ValueError, TypeError):
-                return None
+            return _fast_parse(u)
 
-        if u.version == _UUID_VERSION and u.variant == uuid.RFC_4122:
-            # If it's our own type, extract the inner UUID
-            if isinstance(u, UUIDv7Cat):
-                return u._uuid
-            return u
+        # If it's our own type, extract the inner UUID. An exact type check is a
+        # pointer compare; subclasses still work below through the `int` property.
+        if type(u) is UUIDv7Cat:
+            u = u._uuid
+
+        # Version (bits 76-79) and variant (bits 62-63) checked with one mask
+        u_int = u.int
+        if u_int & _VERSION_VARIANT_MASK == _VERSION_VARIANT_BITS:
+            return u_int
         return None
 
     @staticmethod
@@ -153,13 +441,18 @@ class UUIDv7Cat:
         Returns:
             Category enum member or None if invalid.
         """
-        Category = CategoryProvider.get_categories()
-        u_obj = UUIDv7Cat._basic_validity_check(u)
-        if u_obj:
-            type_id = (u_obj.int >> 68) & 0xFF
-            if type_id in Category._value2member_map_:
-                return Category(type_id)
-        return None
+        if isinstance(u, str):
+            # The same strings tend to recur (log lines, joins); only the
+            # parse is cached, so category changes take effect immediately.
+            type_id = _category_id_from_str(u)
+            if type_id is None:
+                return None
+        else:
+            u_int = UUIDv7Cat._basic_validity_check(u)
+            if u_int is None:
+                return None
+            type_id = (u_int >> 68) & 0xFF
+        return CategoryProvider.get_value_map().get(type_id)
 
     @staticmethod
     def get_timestamp_sec(u: str | uuid.UUID | "UUIDv7Cat") -> str | None:
@@ -174,14 +467,12 @@ class UUIDv7Cat:
             str: string of the timestamp at seconds granularity
             None: If invalid
         """
-        u_obj = UUIDv7Cat._basic_validity_check(u)
-        if u_obj:
-            # The timestamp is now untouched, so we can extract it normally.
-            timestamp_part = u_obj.int >> 80
-            return time.strftime(
-                "%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp_part / 1000)
-            )
-        return None
+        u_int = UUIDv7Cat._basic_validity_check(u)
+        if u_int is None:
+            return None
+        # The timestamp is now untouched, so we can extract it normally.
+        timestamp_part = u_int >> 80
+        return _format_sec(timestamp_part // 1000)
 
     @staticmethod
     def is_valid(u: str | uuid.UUID | "UUIDv7Cat") -> bool:
@@ -195,3 +486,36 @@ class UUIDv7Cat:
             bool: True if valid, False otherwise.
         """
         return UUIDv7Cat.get_category(u) is not None
+
+    @staticmethod
+    def is_valid_many(us: Iterable[str | uuid.UUID | "UUIDv7Cat"]) -> list[bool]:
+        """
+        Check many UUIDs at once; same result as `[is_valid(u) for u in us]`.
+
+        The category map and helpers are looked up once for the whole batch
+        rather than once per UUID.
+
+        Args:
+            us: iterable of UUIDs or strings
+
+        Returns:
+            list[bool]: True for each valid UUIDv7Cat, False otherwise.
+        """
+        value_map = CategoryProvider.get_value_map()
+        check = UUIDv7Cat._basic_validity_check
+        category_id_from_str = _category_id_from_str
+
+        out = []
+        for u in us:
+            if isinstance(u, str):
+                type_id = category_id_from_str(u)
+            else:
+                u_int = check(u)
+                type_id = None if u_int is None else (u_int >> 68) & 0xFF
+            out.append(type_id is not None and type_id in value_map)
+        return out
+
+
+def _unpickle(cls: type[UUIDv7Cat], raw: bytes) -> UUIDv7Cat:
+    """Rebuild a pickled UUIDv7Cat (or subclass) from its 16 raw bytes."""
+    return cls._from_trusted(_trusted_uuid(raw))